@@ -12,6 +12,7 @@
 
 from __future__ import annotations
 import sys
+import math
 from typing import Dict, List, Tuple, Any
 from src.lpSolver.parsing import ParseError, parse_data_dir
 from src.lpSolver.model_arrays import build_model_arrays
@@ -37,8 +38,8 @@ def main(argc: int, argv: List[str]) -> int:
         #Petit récap propre (ne résout rien pour l’instant)
         print("== PARSING OK ==")
         print(f"- Variables ({len(model['variables'])}): " + 
-              ", ".join(f"{n}[{v['type']}:{v['low']},{v['up'] if v['up'] is not None else '∞'}]" 
-                          for n, v in model['variables'].items()))
+              ", ".join(f"{v.Index}[{v.type}:{v.low},{v.up if not math.isnan(v.up) else '∞'}]" 
+                          for v in model['variables'].itertuples()))
         print(f"- Objective: {model['objective']['sense']}  " + 
               " + ".join(f"{c}*{v}" for v, c in model['objective']['coeffs'].items()))
         print(f"- Constraints ({len(model['constraints'])}):")
@@ -58,7 +59,7 @@ def main(argc: int, argv: List[str]) -> int:
         # Appel de la résolution LP
        
         print("== Résolution du problème linéaire ==")
-        result = solve_lp_with_progress(array)
+        result = solve_lp_with_progress(array, msg=False, verbose=True)  # rapport seul, sans journal du solveur
         print(result["details"])
         if result["status"] != "Optimal":
             return 2
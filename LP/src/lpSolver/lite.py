@@ -1,8 +1,13 @@
 from __future__ import annotations
-from typing import Dict, Any, List, Optional, Tuple
+import os
+import hashlib
+from typing import Dict, Any, Iterable, List, Optional, Tuple, Union
+import numpy as np
+import scipy.sparse as sp
+import highspy
 from tqdm import tqdm
 from .model_arrays import LPModelData
-from pulp import LpMinimize, LpMaximize, LpProblem, lpDot, LpVariable, COIN_CMD, LpStatus, value
+from pulp import LpMinimize, LpMaximize, LpProblem, LpAffineExpression, LpVariable, COIN_CMD, LpStatus, value
 
 
 def _normalize_sense(s: str) -> str:
@@ -34,52 +39,256 @@ def _normalize_vtype(t: str) -> str:
         return "binary"
     return "continuous"
 
+def _warm_start_values(warm_start_from: Union[Dict[str, Any], str, None]) -> Optional[Dict[str, float]]:
+    """Valeurs initiales des variables: dict {nom: valeur} ou résultat précédent (clé 'var_values')."""
+    if not isinstance(warm_start_from, dict):
+        return None
+    values = warm_start_from.get("var_values", warm_start_from)
+    return {k: float(v) for k, v in values.items() if isinstance(v, (int, float)) and v == v}
+
+def _warm_start_basis(warm_start_from: Union[Dict[str, Any], str, None]) -> Optional[str]:
+    """Fichier de base CBC (.bas) à relire: chemin explicite ou 'basis_path' d'un résultat précédent."""
+    path = warm_start_from.get("basis_path") if isinstance(warm_start_from, dict) else warm_start_from
+    return path if path and os.path.isfile(path) else None
+
+def _check_cbc_path(path: str, label: str) -> str:
+    """PuLP redécoupe la ligne de commande CBC sur les blancs: un chemin qui en contient serait tronqué."""
+    if any(ch.isspace() for ch in path):
+        raise ValueError(f"{label}: chemin avec espace non supporté par CBC: {path!r}")
+    return path
+
+def _format_details(
+    solver_label: str,
+    status: str,
+    sense: str,
+    objective_value: Optional[float],
+    var_rows: Iterable[Tuple[str, float, Any, Any]],
+    reduced_costs: Dict[str, float],
+    constraints_report: List[Dict[str, Any]],
+    verbose: bool,
+) -> str:
+    """
+    Récap lisible commun aux solveurs; var_rows = [(nom, valeur, lb, ub), ...].
+    Sans 'verbose', seuls l'en-tête, le statut et l'objectif sont formatés (pas de boucle O(n+m)).
+    """
+    def lines():
+        yield f"=== Résultat solveur ({solver_label}) ==="
+        yield f"Statut: {status}"
+        if objective_value is not None:
+            sensestr = "min" if sense == "min" else "max"
+            yield f"Objectif ({sensestr}): {objective_value:.6g}"
+        if not verbose:
+            return
+        yield ""
+        yield "Variables:"
+        yield from (f"  - {name} = {vv:.6g}  [lb={lb}, ub={ub}]" for name, vv, lb, ub in var_rows)
+        if reduced_costs:
+            yield ""
+            yield "Coûts réduits (si disponibles):"
+            yield from (f"  - {name}: {rc:.6g}" for name, rc in reduced_costs.items())
+        if constraints_report:
+            yield ""
+            yield "Contraintes (slack / dual si dispo):"
+            for e in constraints_report:
+                slack = "None" if e["slack"] is None else f"{e['slack']:.6g}"
+                dual = "None" if e["dual"] is None else f"{e['dual']:.6g}"
+                yield f"  - {e['name']}: slack={slack}, dual={dual}"
+    return "\n".join(lines())
+
 def solve_lp_with_progress(
     data: LPModelData,
     *,
     msg: bool = True,
     time_limit: Optional[int] = None,
+    solver: str = "highs",
+    warm_start_from: Union[Dict[str, Any], str, None] = None,
+    basis_path: Optional[str] = None,
+    reuse_problem: bool = True,
+    verbose: bool = False,
 ) -> Dict[str, Any]:
     """
-    Résout un LP/MILP avec PuLP (CBC) à partir d'un LPModelData.
+    Résout un LP/MILP à partir d'un LPModelData.
+    Solveurs ('solver'):
+      - "highs" (défaut): HiGHS en mémoire via highspy, sans fichier ni sous-processus
+      - "cbc": PuLP + binaire CBC
+    Démarrage à chaud (warm start, CBC uniquement) via 'warm_start_from', au choix:
+      - un résultat précédent de cette fonction (var_values + basis_path),
+      - un dict {nom_variable: valeur} (solution initiale transmise à CBC, utile en MILP),
+      - le chemin d'un fichier de base CBC (.bas) d'une résolution précédente (LP continu).
+    Si 'basis_path' est fourni et le problème est continu, la base finale y est sauvegardée
+    (chemin sans espace: ValueError sinon, CBC ne sait pas le recevoir).
+    Avec CBC et 'reuse_problem', le LpProblem construit est gardé en cache par structure
+    (motif creux de A, sens, noms, types): un appel suivant sur un modèle de même structure
+    (balayage de scénarios) ne fait que réécrire coefficients, bornes, RHS et objectif.
     Retourne un dict avec:
       - status: str (ex: "Optimal", "Infeasible", ...)
       - objective: float | None
       - var_values: Dict[str, float]
-      - details: str (récap lisible)
+      - details: str (récap lisible; variables, coûts réduits et contraintes seulement si 'verbose')
       - constraints: List[Dict] (slack, dual si dispo)
       - reduced_costs: Dict[str, float] (si dispo)
+      - basis_path: str | None (base sauvegardée, réutilisable via warm_start_from)
     """
-   
+    solver = (solver or "").strip().lower()
+    if solver == "highs":
+        if warm_start_from is not None or basis_path is not None:
+            raise ValueError("warm_start_from / basis_path ne sont supportés qu'avec solver='cbc'")
+        return _solve_highs(data, msg=msg, time_limit=time_limit, verbose=verbose)
+    if solver == "cbc":
+        return _solve_cbc(
+            data, msg=msg, time_limit=time_limit, warm_start_from=warm_start_from, basis_path=basis_path,
+            reuse_problem=reuse_problem, verbose=verbose,
+        )
+    raise ValueError(f"Solveur non supporté: {solver!r} (attendu: 'highs' ou 'cbc')")
+
+# highspy: HighsModelStatus -> libellés PuLP (LpStatus)
+_HIGHS_STATUS = {
+    highspy.HighsModelStatus.kOptimal: "Optimal",
+    highspy.HighsModelStatus.kInfeasible: "Infeasible",
+    highspy.HighsModelStatus.kUnbounded: "Unbounded",
+    highspy.HighsModelStatus.kTimeLimit: "Not Solved",
+    highspy.HighsModelStatus.kIterationLimit: "Not Solved",
+}
+
+def _solve_highs(data: LPModelData, *, msg: bool, time_limit: Optional[int], verbose: bool) -> Dict[str, Any]:
+    """
+    HiGHS en mémoire via highspy: un seul passModel puis run (presolve + simplexe/MIP).
+    Les contraintes sont passées en lignes à intervalle row_lower <= A x <= row_upper
+    ('<=' -> (-inf, b), '>=' -> (b, +inf), '==' -> (b, b)) et la matrice CSR telle quelle.
+    """
+    sense = _normalize_sense(data.sense)
+    n = len(data.var_names)
+
+    # Variables: bornes et intégrité
+    vtypes = np.array([_normalize_vtype(t) for t in data.vtypes], dtype=np.str_)
+    binary = vtypes == "binary"
+    lb = np.where(binary, 0.0, np.asarray(data.low, dtype=np.float64))
+    ub = np.where(binary, 1.0, np.asarray(data.up, dtype=np.float64))
+    is_int = vtypes != "continuous"
+    is_mip = bool(is_int.any())
+
+    # Contraintes: lignes à intervalle, deux remplissages numpy
+    A = sp.csr_matrix(data.A, dtype=np.float64)
+    b = np.asarray(data.b, dtype=np.float64)
+    ops = np.array([_normalize_constr_sense(op) for op in data.senses], dtype=object)
+    row_lower = np.where(ops == "<=", -np.inf, b)
+    row_upper = np.where(ops == ">=", np.inf, b)
+
+    lp = highspy.HighsLp()
+    lp.num_col_ = n
+    lp.num_row_ = len(b)
+    lp.sense_ = highspy.ObjSense.kMinimize if sense == "min" else highspy.ObjSense.kMaximize
+    lp.col_cost_ = np.asarray(data.c, dtype=np.float64)
+    lp.col_lower_ = lb
+    lp.col_upper_ = ub
+    lp.row_lower_ = row_lower
+    lp.row_upper_ = row_upper
+    lp.a_matrix_.format_ = highspy.MatrixFormat.kRowwise
+    lp.a_matrix_.num_col_ = n
+    lp.a_matrix_.num_row_ = len(b)
+    lp.a_matrix_.start_ = A.indptr
+    lp.a_matrix_.index_ = A.indices
+    lp.a_matrix_.value_ = A.data
+    if is_mip:
+        lp.integrality_ = [highspy.HighsVarType.kInteger if f else highspy.HighsVarType.kContinuous for f in is_int]
+
+    h = highspy.Highs()
+    h.setOptionValue("output_flag", bool(msg))
+    if time_limit is not None:
+        h.setOptionValue("time_limit", float(time_limit))
+    h.passModel(lp)
+    h.run()
+    status = _HIGHS_STATUS.get(h.getModelStatus(), "Undefined")
+
+    # Résultats
+    sol = h.getSolution()
+    has_x = sol.value_valid and status not in ("Infeasible", "Unbounded")
+    x = np.asarray(sol.col_value, dtype=np.float64) + 0.0 if has_x else np.full(n, np.nan)  # -0.0 -> 0.0
+    var_values = dict(zip(data.var_names, x.tolist()))
+    objective_value = float(h.getInfo().objective_function_value) if has_x else None
+
+    # Coûts réduits et duals (LP continu uniquement)
+    reduced_costs: Dict[str, float] = {}
+    duals = np.full(len(b), np.nan)
+    if not is_mip and has_x and sol.dual_valid:
+        reduced_costs = dict(zip(data.var_names, (np.asarray(sol.col_dual) + 0.0).tolist()))
+        duals = np.asarray(sol.row_dual, dtype=np.float64) + 0.0
+    slacks = b - A @ x
+
+    constraints_report = []
+    for j in range(len(b)):
+        name = data.constr_names[j] if j < len(data.constr_names) and data.constr_names[j] else f"c{j}"
+        constraints_report.append({
+            "name": name,
+            "slack": None if np.isnan(slacks[j]) else float(slacks[j]),
+            "dual": None if np.isnan(duals[j]) else float(duals[j]),
+        })
+
+    var_rows = zip(data.var_names, x.tolist(), lb.tolist(), ub.tolist()) if verbose else ()
+    details = _format_details(
+        "HiGHS", status, sense, objective_value, var_rows, reduced_costs, constraints_report, verbose
+    )
+
+    return {
+        "status": status,
+        "objective": objective_value,
+        "var_values": var_values,
+        "constraints": constraints_report,
+        "reduced_costs": reduced_costs,
+        "details": details,
+        "solver": "HiGHS",
+        "basis_path": None,
+    }
+
+def _pulp_bounds(vtype: str, low: Any, up: Any) -> Tuple[str, Optional[float], Optional[float]]:
+    """(catégorie PuLP, borne inf, borne sup); PuLP attend None pour une borne absente (inf dans LPModelData)."""
+    vtype = _normalize_vtype(vtype)
+    if vtype == "binary":
+        return "Binary", 0, 1
+    return (
+        "Integer" if vtype == "integer" else "Continuous",
+        float(low) if low is not None and np.isfinite(low) else None,
+        float(up) if up is not None and np.isfinite(up) else None,
+    )
 
+def _objective_expr(data: LPModelData, lp_vars: List[LpVariable]) -> LpAffineExpression:
+    """Objectif (uniquement les coefficients non nuls)."""
+    return LpAffineExpression([(lp_vars[i], float(data.c[i])) for i in data.c.nonzero()[0]])
+
+def _build_cbc_problem(
+    data: LPModelData, msg: bool
+) -> Tuple[LpProblem, List[LpVariable], List[Tuple[str, Any]]]:
+    """Construit le LpProblem PuLP complet (variables, objectif, contraintes)."""
     # 1) Problème
     sense = _normalize_sense(data.sense)
     prob_sense = LpMinimize if sense == "min" else LpMaximize
     prob = LpProblem("LPModel", prob_sense)
 
     # 2) Variables
-    lp_vars: List[LpVariable] = []
-    for i, name in enumerate(tqdm(data.var_names, desc="Création des variables")):
-        vtype = _normalize_vtype(data.vtypes[i] if i < len(data.vtypes) else "continuous")
-        low = float(data.low[i]) if i < len(data.low) and data.low[i] is not None else None
-        up = float(data.up[i]) if i < len(data.up) and data.up[i] is not None else None
-
-        if vtype == "binary":
-            var = LpVariable(name, lowBound=0, upBound=1, cat="Binary")
-        elif vtype == "integer":
-            var = LpVariable(name, lowBound=low, upBound=up, cat="Integer")
-        else:
-            var = LpVariable(name, lowBound=low, upBound=up, cat="Continuous")
-        lp_vars.append(var)
+    # Regroupées par (catégorie, bornes) puis créées en lot avec LpVariable.dicts ("%s" => nom = index),
+    # et replacées dans l'ordre de var_names.
+    buckets: Dict[Tuple[str, Optional[float], Optional[float]], List[str]] = {}
+    for name, t, l, u in zip(data.var_names, data.vtypes, data.low, data.up):
+        buckets.setdefault(_pulp_bounds(t, l, u), []).append(name)
+    by_name: Dict[str, LpVariable] = {}
+    for (cat, low, up), names in buckets.items():
+        by_name.update(LpVariable.dicts("%s", names, lowBound=low, upBound=up, cat=cat))
+    lp_vars: List[LpVariable] = [by_name[name] for name in data.var_names]
 
     # 3) Objectif
-    # lpDot gère les vecteurs alignés
-    prob += lpDot(data.c, lp_vars), "Objective"
+    prob += _objective_expr(data, lp_vars), "Objective"
 
     # 4) Contraintes
+    # Chaque ligne CSR donne directement ses couples (colonne, valeur): on construit
+    # l'expression sans parcourir les n colonnes ni sommer des termes nuls.
+    A = data.A
+    indptr, indices, values = A.indptr, A.indices, A.data
     constr_infos: List[Tuple[str, Any]] = []
-    for j, row in enumerate(tqdm(data.A, desc="Ajout des contraintes")):
-        lhs = lpDot(row, lp_vars)
+    for j in tqdm(range(A.shape[0]), desc="Ajout des contraintes", mininterval=1.0, disable=not msg):
+        start, end = indptr[j], indptr[j + 1]
+        lhs = LpAffineExpression(
+            [(lp_vars[k], float(coef)) for k, coef in zip(indices[start:end], values[start:end])]
+        )
         rhs = float(data.b[j])
         op = _normalize_constr_sense(data.senses[j])
         name = data.constr_names[j] if j < len(data.constr_names) and data.constr_names[j] else f"c{j}"
@@ -92,9 +301,110 @@ def solve_lp_with_progress(
         prob += c, name
         constr_infos.append((name, c))
 
-    # 5) Solveur CBC
-    solver = COIN_CMD(msg=False, timeLimit=time_limit, path="/opt/homebrew/bin/cbc")
+    return prob, lp_vars, constr_infos
+
+# Squelettes PuLP déjà construits, par structure de modèle (voir _structure_key)
+_PROB_CACHE: Dict[bytes, Tuple[LpProblem, List[LpVariable], List[Tuple[str, Any]]]] = {}
+_PROB_CACHE_SIZE = 8
+
+def _structure_key(data: LPModelData) -> bytes:
+    """
+    Empreinte de la topologie du modèle: motif creux de A (indptr/indices), sens des contraintes,
+    noms et types. Deux modèles de même empreinte ne diffèrent que par leurs valeurs numériques.
+    """
+    h = hashlib.blake2b(digest_size=16)
+    h.update(np.asarray(data.A.indptr, dtype=np.int64).tobytes())
+    h.update(np.asarray(data.A.indices, dtype=np.int64).tobytes())
+    for field in (data.senses, data.var_names, data.constr_names, data.vtypes):
+        h.update("\0".join(map(str, field)).encode())
+        h.update(b"\1")
+    return h.digest()
+
+def _update_cbc_problem(
+    prob: LpProblem, lp_vars: List[LpVariable], constr_infos: List[Tuple[str, Any]], data: LPModelData
+) -> None:
+    """Réécrit en place les valeurs numériques d'un squelette de même structure: sens, bornes, objectif, A, b."""
+    prob.sense = LpMinimize if _normalize_sense(data.sense) == "min" else LpMaximize
+    for v, t, l, u in zip(lp_vars, data.vtypes, data.low, data.up):
+        _cat, v.lowBound, v.upBound = _pulp_bounds(t, l, u)
+    objective = _objective_expr(data, lp_vars)
+    objective.name = "Objective"
+    prob.setObjective(objective)
+    A = data.A
+    indptr, indices, values = A.indptr, A.indices, A.data
+    for j, (_name, c) in enumerate(constr_infos):
+        start, end = indptr[j], indptr[j + 1]
+        expr = c.expr
+        for k, coef in zip(indices[start:end], values[start:end]):
+            expr[lp_vars[k]] = float(coef)
+        c.changeRHS(float(data.b[j]))
+
+def _solve_cbc(
+    data: LPModelData,
+    *,
+    msg: bool,
+    time_limit: Optional[int],
+    warm_start_from: Union[Dict[str, Any], str, None],
+    basis_path: Optional[str],
+    reuse_problem: bool,
+    verbose: bool,
+) -> Dict[str, Any]:
+    """PuLP + CBC (voir solve_lp_with_progress pour le démarrage à chaud et la réutilisation)."""
+    sense = _normalize_sense(data.sense)
+    n = len(data.var_names)
+    if not (len(data.vtypes) == len(data.low) == len(data.up) == n):
+        raise ValueError(
+            f"LPModelData incohérent: {n} variables, {len(data.vtypes)} types, "
+            f"{len(data.low)} bornes inf, {len(data.up)} bornes sup"
+        )
+    if basis_path:
+        _check_cbc_path(basis_path, "basis_path")
+    key = _structure_key(data) if reuse_problem else None
+    cached = _PROB_CACHE.get(key) if key is not None else None
+    if cached is None:
+        prob, lp_vars, constr_infos = _build_cbc_problem(data, msg)
+        if key is not None:
+            if len(_PROB_CACHE) >= _PROB_CACHE_SIZE:
+                _PROB_CACHE.pop(next(iter(_PROB_CACHE)))  # le plus ancien
+            _PROB_CACHE[key] = (prob, lp_vars, constr_infos)
+    else:
+        prob, lp_vars, constr_infos = cached
+        _update_cbc_problem(prob, lp_vars, constr_infos, data)
+
+    # 5) Solveur CBC (avec démarrage à chaud éventuel)
+    start_values = _warm_start_values(warm_start_from)
+    if start_values:
+        for v in lp_vars:
+            val = start_values.get(v.name)
+            if val is None:
+                continue
+            # CBC écrit sa solution arrondie (~8 chiffres): une valeur sur une borne non ronde
+            # peut la dépasser légèrement, on la ramène donc dans [lowBound, upBound]
+            if v.lowBound is not None:
+                val = max(val, v.lowBound)
+            if v.upBound is not None:
+                val = min(val, v.upBound)
+            v.setInitialValue(val)
+    options: List[str] = []
+    start_basis = _warm_start_basis(warm_start_from)
+    if start_basis is not None:
+        options.append(f"basisIn {_check_cbc_path(start_basis, 'warm_start_from')}")
+    saved_basis = None
+    if basis_path and not prob.isMIP():
+        # Les options passent avant la résolution finale de PuLP: on résout ici, on exporte
+        # la base, puis la résolution de PuLP repart de cette base optimale (0 itération).
+        options.append(f"initialSolve basisOut {basis_path}")
+        saved_basis = basis_path
+    solver = COIN_CMD(
+        msg=False,
+        timeLimit=time_limit,
+        path="/opt/homebrew/bin/cbc",
+        warmStart=bool(start_values),
+        options=options,
+    )
     status_code = prob.solve(solver)
+    if saved_basis is not None and not os.path.isfile(saved_basis):
+        saved_basis = None
     status = LpStatus.get(status_code, str(status_code))
 
     # 6) Récupération des résultats
@@ -106,70 +416,41 @@ def solve_lp_with_progress(
         objective_value = None
 
     # Coûts réduits (dj) et duals/slacks si supportés (LP continu)
-    reduced_costs: Dict[str, float] = {}
-    for v in lp_vars:
-        try:
-            # v.dj n'est pas défini pour MIP; on ignore silencieusement
-            rc = getattr(v, "dj")
-            if rc is not None:
-                reduced_costs[v.name] = float(rc)
-        except Exception:
-            pass
+    # Lecture en lot avec getattr(..., None): pas de try/except par variable ni par contrainte
+    # (v.dj / c.pi ne sont pas renseignés pour un MIP).
+    reduced_costs: Dict[str, float] = {
+        v.name: float(rc) for v in lp_vars if (rc := getattr(v, "dj", None)) is not None
+    }
 
-    constraints_report = []
-    for name, _c in constr_infos:
-        c = prob.constraints.get(name)
-        if c is None:
-            continue
-        entry = {"name": name}
-        # slack
-        try:
-            entry["slack"] = float(c.slack)
-        except Exception:
-            entry["slack"] = None
-        # dual (pi) – dispo pour LP continu avec CBC
-        try:
-            pi = getattr(c, "pi", None)
-            entry["dual"] = float(pi) if pi is not None else None
-        except Exception:
-            entry["dual"] = None
-        constraints_report.append(entry)
+    solved_constraints = ((name, prob.constraints.get(name)) for name, _c in constr_infos)
+    constraints_report = [
+        {
+            "name": name,
+            "slack": None if (slack := getattr(c, "slack", None)) is None else float(slack),
+            "dual": None if (pi := getattr(c, "pi", None)) is None else float(pi),
+        }
+        for name, c in solved_constraints
+        if c is not None
+    ]
 
     # 7) Détails lisibles
-    lines = []
-    lines.append("=== Résultat solveur (PuLP/CBC) ===")
-    lines.append(f"Statut: {status}")
-    if objective_value is not None:
-        sensestr = "min" if sense == "min" else "max"
-        lines.append(f"Objectif ({sensestr}): {objective_value:.6g}")
-    lines.append("")
-    lines.append("Variables:")
-    for v in lp_vars:
-        lb = v.lowBound if v.lowBound is not None else float("-inf")
-        ub = v.upBound if v.upBound is not None else float("inf")
-        vv = v.value()
-        lines.append(f"  - {v.name} = {vv:.6g}  [lb={lb}, ub={ub}]")
-    if reduced_costs:
-        lines.append("")
-        lines.append("Coûts réduits (si disponibles):")
-        for name, rc in reduced_costs.items():
-            lines.append(f"  - {name}: {rc:.6g}")
-    if constraints_report:
-        lines.append("")
-        lines.append("Contraintes (slack / dual si dispo):")
-        for e in constraints_report:
-            slack = "None" if e["slack"] is None else f"{e['slack']:.6g}"
-            dual = "None" if e["dual"] is None else f"{e['dual']:.6g}"
-            lines.append(f"  - {e['name']}: slack={slack}, dual={dual}")
-
-    details = "\n".join(lines)
+    var_rows = (
+        (name, vv,
+         v.lowBound if v.lowBound is not None else float("-inf"),
+         v.upBound if v.upBound is not None else float("inf"))
+        for (name, vv), v in zip(var_values.items(), lp_vars)
+    )
+    details = _format_details(
+        "PuLP/CBC", status, sense, objective_value, var_rows, reduced_costs, constraints_report, verbose
+    )
 
     return {
         "status": status,
         "objective": objective_value,
         "var_values": var_values,
-        "details": details,
         "constraints": constraints_report,
         "reduced_costs": reduced_costs,
+        "details": details,
         "solver": "CBC",
+        "basis_path": saved_basis,
     }
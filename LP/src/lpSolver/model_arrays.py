@@ -1,4 +1,9 @@
-from typing import NamedTuple, Optional, Dict, List, Any
+from __future__ import annotations
+from typing import NamedTuple, Dict, List, Any
+
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
 
 
 class LPModelData(NamedTuple):
@@ -7,79 +12,121 @@ class LPModelData(NamedTuple):
     - var_names: noms des variables, dans l'ordre utilisé partout
     - c: coefficients de l'objectif alignés sur var_names
     - sense: "min" ou "max"
-    - A: matrice des coefficients des contraintes (LHS)
+    - A: matrice creuse CSR (Compressed Sparse Row) des coefficients des contraintes (LHS)
     - senses: opérateurs des contraintes (<=, >=, ==) alignés sur A
     - b: seconds membres (RHS) alignés sur A
-    - low/up: bornes inf/sup des variables, alignées sur var_names
+    - low/up: bornes inf/sup des variables, alignées sur var_names (up = inf si non bornée)
     - vtypes: types des variables (continuous/integer/binary)
     - constr_names: noms des contraintes pour le solveur
     - var_index: mapping nom -> index
+
+    A.data, b et c sont en float64 par défaut. Avec dtype=np.float32 (build_model_arrays,
+    parse_data_dir(..., as_arrays=True)) ils occupent moitié moins de mémoire, au prix
+    d'environ 7 chiffres significatifs: suffisant pour la plupart des LP issus de CSV, à éviter
+    pour des coefficients type big-M ou des MILP sensibles (tolérances d'intégralité).
+    Les solveurs repassent en float64 au moment de la résolution.
     """
 
     var_names: List[str]
-    c: List[float]
+    c: np.ndarray
     sense: str
-    A: List[List[float]]
+    A: sp.csr_matrix
     senses: List[str]
-    b: List[float]
-    low: List[float]
-    up: List[Optional[float]]
-    vtypes: List[str]
+    b: np.ndarray
+    low: np.ndarray
+    up: np.ndarray
+    vtypes: np.ndarray
     constr_names: List[str]
     var_index: Dict[str, int]
 
 
-def build_model_arrays(model: Dict[str, Any]) -> LPModelData:
-    """Convertit la sortie de parsing (dict) en tableaux pour le solveur."""
-    # 1) variables & index
-    var_names = list(model["variables"].keys())
+def model_arrays_from_triplets(
+    variables: Any,
+    objective: Dict[str, Any],
+    rows: List[int],
+    cols: List[int],
+    vals: List[float],
+    b: List[float],
+    senses: List[str],
+    constr_names: List[str],
+    dtype: Any = np.float64,
+) -> LPModelData:
+    """
+    Assemble un LPModelData à partir des variables (DataFrame low/up/type indexé par nom,
+    ou dict {nom: meta}), de l'objectif du parsing et des triplets CSR des contraintes.
+    'dtype' (float64 ou float32) s'applique au stockage de A, b et c.
+    """
+    # 1) variables & index (DataFrame colonnes low/up/type ; dict {nom: meta} toléré)
+    if isinstance(variables, dict):
+        variables = pd.DataFrame.from_dict(variables, orient="index", columns=["low", "up", "type"])
+    var_names = variables.index.tolist()
     var_index = {name: i for i, name in enumerate(var_names)}
     n = len(var_names)
 
-    # 2) bornes & types
-    low: List[float] = []
-    up: List[Optional[float]] = []
-    vtypes: List[str] = []
-    for name in var_names:
-        meta = model["variables"][name]
-        low.append(float(meta["low"]) if meta["low"] is not None else 0.0)
-        up.append(float(meta["up"]) if meta["up"] is not None else None)
-        vtypes.append(meta["type"])
-
-    # 3) objectif
-    sense = str(model["objective"]["sense"]).lower()
-    c = [0.0] * n
-    for v, coeff in model["objective"]["coeffs"].items():
-        c[var_index[v]] = float(coeff)
-
-    # 4) contraintes
-    A: List[List[float]] = []
-    b: List[float] = []
-    senses: List[str] = []
-    constr_names: List[str] = []
-    for cst in model["constraints"]:
-        row = [0.0] * n
-        for v, coef in cst["coeffs"].items():
-            row[var_index[v]] = float(coef)
-        A.append(row)
-        b.append(float(cst["rhs"]))
-        senses.append(cst["sense"])
-        constr_names.append(cst["name"])
+    # 2) bornes & types: lecture directe des colonnes, sans boucle Python
+    low = variables["low"].astype("float64").fillna(0.0).to_numpy()
+    up = variables["up"].astype("float64").fillna(np.inf).to_numpy()
+    vtypes = variables["type"].to_numpy(dtype=np.str_)
+
+    # 3) objectif: placement des coefficients par indexation avancée (fancy indexing)
+    sense = str(objective["sense"]).lower()
+    obj_items = objective["coeffs"].items()
+    k = len(obj_items)
+    idx = np.fromiter((var_index[v] for v, _ in obj_items), dtype=np.int64, count=k)
+    vals_c = np.fromiter((coeff for _, coeff in obj_items), dtype=np.float64, count=k)
+    c = np.zeros(n, dtype=dtype)
+    c[idx] = vals_c
+
+    # 4) contraintes: triplets (ligne, colonne, valeur) -> CSR, en O(nnz) au lieu de O(m*n)
+    m = len(b)
+    A = sp.csr_matrix((np.asarray(vals, dtype=dtype), (rows, cols)), shape=(m, n), dtype=dtype)
 
     return LPModelData(
         var_names=var_names,
         c=c,
         sense=sense,
         A=A,
-        senses=senses,
-        b=b,
+        senses=list(senses),
+        b=np.asarray(b, dtype=dtype),
         low=low,
         up=up,
         vtypes=vtypes,
-        constr_names=constr_names,
+        constr_names=list(constr_names),
         var_index=var_index,
     )
 
 
-__all__ = ["LPModelData", "build_model_arrays"]
+def build_model_arrays(model: Dict[str, Any] | LPModelData, dtype: Any = np.float64) -> LPModelData:
+    """
+    Convertit la sortie de parsing (dict) en tableaux pour le solveur.
+    Un LPModelData (parse_data_dir(..., as_arrays=True)) est renvoyé tel quel.
+    'dtype': stockage de A, b et c (voir LPModelData pour le compromis float32).
+    """
+    if isinstance(model, LPModelData):
+        return model
+
+    variables = model["variables"]
+    var_names = variables.index.tolist() if not isinstance(variables, dict) else list(variables)
+    var_index = {name: i for i, name in enumerate(var_names)}
+    rows: List[int] = []
+    cols: List[int] = []
+    vals: List[float] = []
+    b: List[float] = []
+    senses: List[str] = []
+    constr_names: List[str] = []
+    for j, cst in enumerate(model["constraints"]):
+        # index/valeurs dérivés ici de 'coeffs' (clés internées au parsing): une seule structure par ligne
+        coeffs = cst["coeffs"]
+        rows.extend([j] * len(coeffs))
+        cols.extend(map(var_index.__getitem__, coeffs))
+        vals.extend(coeffs.values())
+        b.append(float(cst["rhs"]))
+        senses.append(cst["sense"])
+        constr_names.append(cst["name"])
+
+    return model_arrays_from_triplets(
+        variables, model["objective"], rows, cols, vals, b, senses, constr_names, dtype=dtype
+    )
+
 
+__all__ = ["LPModelData", "build_model_arrays", "model_arrays_from_triplets"]
@@ -12,10 +12,16 @@
 
 from __future__ import annotations
 import sys
-import csv
-import os
 import re
-from typing import Dict, List, Tuple, Any
+import os
+import hashlib
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterator, List, Tuple, Any
+
+import pandas as pd
+
+from .model_arrays import LPModelData, model_arrays_from_triplets
 
 # ---------------------------
 # Exceptions dédiées parsing
@@ -40,98 +46,261 @@ def _first_existing(*paths: str) -> str:
             return p
     raise ParseError("Aucun des fichiers suivants n'a été trouvé: " + ", ".join(paths))
 
-def _read_csv_dicts(path: str, required_headers: List[str]) -> List[Dict[str, str]]:
+def _read_csv_frame(path: str, required_headers: List[str]) -> pd.DataFrame:
     """
-    Lit un CSV (Comma-Separated Values) en dictionnaire et vérifie les en-têtes.
-    Retourne une liste de lignes (dict) avec suppression des espaces superflus.
+    Lit un CSV (Comma-Separated Values) en DataFrame de chaînes et vérifie les en-têtes.
+    En-têtes et cellules sont débarrassés des espaces superflus ; cellule vide => "".
     """
     try:
-        with open(path, "r", newline="", encoding="utf-8") as f:
-            reader = csv.DictReader(f)
-            if reader.fieldnames is None:
-                raise ParseError(f"{path}: en-têtes manquantes.")
-            headers = [h.strip() for h in reader.fieldnames]
-            # Remap DictReader pour trim headers
-            reader.fieldnames = headers
-
-            missing = [h for h in required_headers if h not in headers]
-            if missing:
-                raise ParseError(f"{path}: en-têtes manquantes: {missing} ; attendues: {required_headers}")
-
-            rows: List[Dict[str, str]] = []
-            for i, row in enumerate(reader, start=2):  # start=2 car ligne 1 = headers
-                clean = {k: (v.strip() if isinstance(v, str) else v) for k, v in row.items()}
-                rows.append(clean)
-            return rows
-    except csv.Error as e:
+        df = pd.read_csv(path, dtype=str, keep_default_na=False, index_col=False, encoding="utf-8")
+    except pd.errors.EmptyDataError:
+        raise ParseError(f"{path}: en-têtes manquantes.")
+    except (pd.errors.ParserError, UnicodeDecodeError) as e:
         raise ParseError(f"{path}: CSV invalide ({e})")
 
-def _parse_float(field: str, value: str, path: str, line_no: int, allow_empty: bool = False) -> float | None:
-    if value == "" and allow_empty:
-        return None
-    try:
-        return float(value)
-    except ValueError:
-        raise ParseError(f"{path}:{line_no}: '{field}' doit être un nombre (reçu: '{value}')")
+    df.columns = df.columns.str.strip()
+    missing = [h for h in required_headers if h not in df.columns]
+    if missing:
+        raise ParseError(f"{path}: en-têtes manquantes: {missing} ; attendues: {list(required_headers)}")
+    return df[required_headers].fillna("").apply(lambda col: col.str.strip())
+
+def _first_bad_row(mask: pd.Series) -> int | None:
+    """Position (0-based) de la première ligne où 'mask' est vrai, None sinon."""
+    return int(mask.to_numpy().argmax()) if mask.any() else None
+
+def _parse_float_column(df: pd.DataFrame, field: str, path: str, allow_empty: bool = False) -> pd.Series:
+    """
+    Convertit une colonne en flottants (float64) en un seul appel vectorisé.
+    Cellule vide => NaN si allow_empty ; sinon ParseError avec le numéro de ligne fautif.
+    """
+    raw = df[field]
+    empty = raw == ""
+    values = pd.to_numeric(raw.where(~empty), errors="coerce").astype("float64")
+    pos = _first_bad_row((values.isna() & ~empty) if allow_empty else (values.isna() | empty))
+    if pos is not None:
+        raise ParseError(f"{path}:{pos + 2}: '{field}' doit être un nombre (reçu: '{raw.iloc[pos]}')")
+    return values
 
 # ---------------------------------------------------
 # Parsing des expressions linéaires (LHS) de contraintes
 # Supporte:  x + 2y - 3*z + 5  (la constante 5 sera déplacée du LHS vers le RHS)
 #            2*x + y,  -x + 1.5*y,  2.0e-3*z
 # ---------------------------------------------------
-_VAR_NAME_RE = re.compile(r"[A-Za-z_][A-Za-z0-9_]*")
+# Un terme = [signes] [nombre] [*] [identifiant] ; la regex compilée (moteur C) fait
+# le découpage en un seul passage via finditer, les termes doivent être contigus.
+# Chemin de repli de parse_linear_expr (voir _split_expr pour le cas courant).
+_TERM_RE = re.compile(
+    r"""\s*
+    ((?:[-+]\s*)*)                                 # signes (tolère '- y', '+ -3*z', ...)
+    ((?:\d+\.?\d*|\.\d*)(?:[eE][-+]?\d+)?)?      # coeff: 2, 2.5, .5, 1.2e3, 2.0e-3
+    \s*(\*)?\s*
+    ([A-Za-z_][A-Za-z0-9_]*)?                       # variable
+    """,
+    re.VERBOSE,
+)
+
+def _scan_expr(expr: str) -> Tuple[List[str], List[float], float]:
+    """
+    Découpe 'expr' en termes via _TERM_RE.finditer.
+    Retourne les listes parallèles (noms, coefficients) dans l'ordre d'apparition
+    et la somme des constantes isolées.
+    Grammaire d'un terme: [signes] [nombre] [*] [identifiant], avec au moins
+    un nombre ou un identifiant ; les termes sont séparés par '+' ou '-'.
+    """
+    expr = expr.replace("−", "-")  # normalise le signe moins unicode
+    names: List[str] = []
+    coeffs: List[float] = []
+    const_sum = 0.0
+    n = len(expr)
+    pos = 0
+    for m in _TERM_RE.finditer(expr):
+        start, end = m.span()
+        if start == end or start != pos:
+            if pos >= n or not expr[pos:].strip():
+                break
+            # caractère hors grammaire (ex: 'é'): la regex ne progresse plus
+            raise ParseError(f"Terme invalide '{expr[pos:].strip()}' (ni variable ni constante)")
+        pos = end
+        sign, coef, star, var = m.groups()
+        if not sign:
+            if var is None and coef is None and not star:
+                continue  # blancs seuls (fin d'expression)
+            if start:
+                raise ParseError(f"Terme invalide '{expr[start:].strip()}' (opérateur '+' ou '-' attendu)")
+        if var is None:
+            if star:
+                raise ParseError(f"Terme invalide '{m.group().strip()}' (variable attendue après '*')")
+            if coef is None:
+                raise ParseError(f"Terme invalide '{expr[start:].strip()}' (ni variable ni constante)")
+        if coef is None:
+            value = 1.0
+        else:
+            try:
+                value = float(coef)
+            except ValueError:
+                raise ParseError(f"Terme invalide '{m.group().strip()}' (coeff non numérique)")
+        if sign.count("-") & 1:
+            value = -value
+
+        if var is None:
+            const_sum += value
+        else:
+            names.append(var)
+            coeffs.append(value)
+
+    return names, coeffs, const_sum
+
+_NUMBER_CHARS = "0123456789.eE"
+
+def _split_expr(expr: str) -> Tuple[Dict[str, float], float] | None:
+    """
+    Chemin rapide (méthodes str, exécutées en C): split sur '+' après 'replace("-", "+-")',
+    puis chaque terme '[-] nombre * identifiant', '[-] identifiant' ou '[-] nombre'.
+    Retourne None dès qu'un terme sort de ces formes ('2x', opérateurs doublés, terme vide,
+    exposant signé coupé par le split ('2.0e' -> float invalide), erreur...) : _scan_expr
+    traite alors l'expression entière.
+    """
+    s = expr.replace("−", "-")
+    if not s.isascii():
+        return None
+    parts = s.replace("-", "+-").split("+")
+    if not parts[0].strip():
+        del parts[0]  # signe en tête: '-x + y'
+
+    coeffs: Dict[str, float] = {}
+    const_sum = 0.0
+    for term in parts:
+        term = term.strip()
+        if not term:
+            return None
+        neg = term[0] == "-"
+        if neg:
+            term = term[1:].lstrip()  # '- y'
+        coef_str, star, var = term.partition("*")
+        if star:
+            coef_str = coef_str.rstrip()
+            var = var.lstrip()
+            if not (coef_str and var.isidentifier() and not coef_str.lstrip(_NUMBER_CHARS)):
+                return None
+        elif term.isidentifier():
+            coef_str, var = "", term
+        elif term and not term.lstrip(_NUMBER_CHARS):
+            coef_str, var = term, ""
+        else:
+            return None
+        try:
+            value = float(coef_str) if coef_str else 1.0
+        except ValueError:
+            return None  # '1.2.3', '2.0e'...: message d'erreur produit par _scan_expr
+        if neg:
+            value = -value
+        if var:
+            coeffs[var] = coeffs.get(var, 0.0) + value
+        else:
+            const_sum += value
+    return coeffs, const_sum
 
 def parse_linear_expr(expr: str) -> Tuple[Dict[str, float], float]:
     """
     Parse une expression linéaire du LHS (Left-Hand Side) et retourne:
       - coeffs: dict {var_name: coeff}
       - const_sum: constante présente sur le LHS (sera soustraite au RHS ensuite)
-    Autorise les formes: 'x', '2x', '2*x', '- y', '+3*z', '1.2e3*a'
+    Autorise les formes: 'x', '2x', '2*x', '- y', '+3*z', '1.2e3*a', '2.0e-3*z'
     Autorise aussi des constantes isolées: '+ 5', '-10' (elles iront dans const_sum)
     """
     if expr is None:
         raise ParseError("Expression vide")
-    s = expr.replace("−", "-")  # normalise le signe moins unicode
-    s = s.replace("-", "+-")    # facilite le split sur '+'
-    parts = [p.strip() for p in s.split("+") if p.strip() != ""]
-    if not parts:
+    if not expr.strip():
         raise ParseError(f"Expression invalide: '{expr}'")
-
-    coeffs: Dict[str, float] = {}
-    const_sum: float = 0.0
-
-    for term in parts:
-        m = _VAR_NAME_RE.search(term)
-        if m:
-            var = m.group(0)
-            coeff_str = term[:m.start()].replace("*", "").strip()
-            if coeff_str in ("", "+"):
-                coeff = 1.0
-            elif coeff_str == "-":
-                coeff = -1.0
-            else:
-                try:
-                    coeff = float(coeff_str)
-                except ValueError:
-                    raise ParseError(f"Terme invalide '{term}' (coeff non numérique)")
+    split = _split_expr(expr)
+    if split is not None:
+        coeffs, const_sum = split
+    else:
+        names, values, const_sum = _scan_expr(expr)
+        coeffs = {}
+        for var, coeff in zip(names, values):
             coeffs[var] = coeffs.get(var, 0.0) + coeff
-        else:
-            # constante pure
-            try:
-                const = float(term.replace("*", ""))
-            except ValueError:
-                raise ParseError(f"Terme invalide '{term}' (ni variable ni constante)")
-            const_sum += const
 
     coeffs = {v: c for v, c in coeffs.items() if abs(c) > 0.0}
     if not coeffs and const_sum == 0.0:
         raise ParseError(f"Expression sans variables ni constantes: '{expr}'")
     return coeffs, const_sum
 
+# ---------------------------------------------------
+# Parsing parallèle des expressions (optionnel, voir parse_data_dir(workers=...))
+# ---------------------------------------------------
+
+def _parse_expr_or_error(expr: str) -> Tuple[Dict[str, float], float] | ParseError:
+    """Variante pour les workers: l'erreur est renvoyée (pas levée) pour être relevée dans l'ordre des lignes."""
+    try:
+        return parse_linear_expr(expr)
+    except ParseError as e:
+        return e
+
+def _parse_exprs(exprs: List[str], workers: int | None) -> Iterator[Tuple[Dict[str, float], float] | ParseError]:
+    """
+    Parse les expressions dans l'ordre, en série ou réparties sur 'workers' processus (si > 1).
+    Résultats produits au fil de l'eau (itérateur) pour ne pas garder toutes les expressions parsées en mémoire.
+    """
+    if not workers or workers < 2:
+        yield from map(_parse_expr_or_error, exprs)
+        return
+    chunksize = max(1, len(exprs) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as ex:
+        yield from ex.map(_parse_expr_or_error, exprs, chunksize=chunksize)
+
+# ---------------------------------------------------
+# Cache binaire du parsing (clé = chemins + mtime + taille des CSV)
+# ---------------------------------------------------
+_CACHE_DIR = ".cache"
+_CACHE_VERSION = 5  # à incrémenter si le format du dict retourné (ou du cache) change
+
+def _cache_path(data_dir: str, paths: List[str], kind: str) -> str:
+    """Chemin du cache; 'kind' ("model" | "arrays") distingue les deux formes de sortie."""
+    stats = [(p, os.stat(p).st_mtime_ns, os.stat(p).st_size) for p in paths]
+    key = hashlib.blake2b(repr((_CACHE_VERSION, stats)).encode(), digest_size=16).hexdigest()
+    return os.path.join(data_dir, _CACHE_DIR, f"{kind}-{key}.pkl")
+
+def _load_cache(path: str) -> Tuple[Dict[str, Any] | LPModelData, List[str]] | None:
+    """(modèle, avertissements émis au parsing) ou None."""
+    try:
+        with open(path, "rb") as f:
+            model, warnings = pickle.load(f)
+        return model, warnings
+    except Exception:
+        return None  # absent, illisible ou ancien format: on reparse
+
+def _store_cache(path: str, model: Dict[str, Any] | LPModelData, warnings: List[str]) -> None:
+    """
+    Écrit le cache (modèle + avertissements, réaffichés lors d'une relecture) de façon atomique
+    et supprime les entrées périmées de même forme ; échec silencieux.
+    """
+    cache_dir = os.path.dirname(path)
+    kind = os.path.basename(path).split("-", 1)[0]
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            pickle.dump((model, warnings), f, protocol=5)
+        os.replace(tmp, path)
+        for entry in os.listdir(cache_dir):
+            stale = entry.startswith(f"{kind}-") or "-" not in entry  # sans préfixe: ancien format
+            if stale and entry.endswith(".pkl") and entry != os.path.basename(path):
+                os.remove(os.path.join(cache_dir, entry))
+    except OSError:
+        pass
+
 # ---------------------------------------------------
 # Parsing du dossier ./data (variables.csv, objective(s).csv, constraints.csv)
 # ---------------------------------------------------
-def parse_data_dir(data_dir: str) -> Dict[str, Any]:
+def parse_data_dir(
+    data_dir: str,
+    *,
+    use_cache: bool = True,
+    as_arrays: bool = False,
+    dtype: Any = "float64",
+    workers: int | None = None,
+) -> Dict[str, Any] | LPModelData:
     """
     Parse le dossier de données contenant:
       - variables.csv : name, low, up, type
@@ -142,6 +311,15 @@ def parse_data_dir(data_dir: str) -> Dict[str, Any]:
       - objectif: sense constant (min|max), var déclarées, coeff numériques
       - contraintes: sense ∈ {<=,>=,==}, rhs numérique, expr linéaire, vars déclarées
       - déplacement des constantes LHS vers RHS
+    'variables' est un DataFrame indexé par nom (colonnes low, up, type ; up = NaN si non bornée).
+    Si as_arrays, les contraintes sont versées directement en triplets CSR pendant la lecture
+    (sans liste intermédiaire de dicts ni raw_expr/raw_rhs/moved_const) et un LPModelData est
+    retourné, prêt pour le solveur ; 'dtype' ("float64" ou "float32") fixe alors le stockage de A, b et c.
+    Si workers > 1, les expressions sont parsées dans un ProcessPoolExecutor de 'workers' processus
+    (uniquement intéressant pour de gros fichiers sur une machine multi-cœur: le processus parent
+    paie toujours la désérialisation des résultats). Par défaut, parsing en série.
+    Si use_cache, le résultat est mis en cache dans <data_dir>/.cache/ et relu tel quel
+    tant que les trois CSV n'ont pas changé (mtime + taille) ; les avertissements sont alors réaffichés.
     """
     if not os.path.isdir(data_dir):
         raise ParseError(f"Dossier introuvable: {data_dir}")
@@ -156,47 +334,70 @@ def parse_data_dir(data_dir: str) -> Dict[str, Any]:
     _require_file(var_path)
     _require_file(con_path)
 
+    cache_kind = "model"
+    if as_arrays:
+        dtype_name = pd.api.types.pandas_dtype(dtype).name
+        cache_kind = "arrays" if dtype_name == "float64" else f"arrays_{dtype_name}"
+    cache_path = _cache_path(data_dir, [var_path, obj_path, con_path], cache_kind) if use_cache else None
+    if cache_path is not None:
+        cached = _load_cache(cache_path)
+        if cached is not None:
+            model, warnings = cached
+            for warning in warnings:
+                print(warning, file=sys.stderr)
+            return model
+
     # --- variables.csv ---
-    vars_rows = _read_csv_dicts(var_path, ["name", "low", "up", "type"])
-    variables: Dict[str, Dict[str, Any]] = {}
-    allowed_types = {"continuous", "integer", "binary"}
-    for i, row in enumerate(vars_rows, start=2):
-        name = row["name"]
-        if not name:
-            raise ParseError(f"{var_path}:{i}: 'name' vide")
-        if name in variables:
-            raise ParseError(f"{var_path}:{i}: variable dupliquée: '{name}'")
-
-        vtype = row["type"].lower() if row["type"] else "continuous"
-        if vtype not in allowed_types:
-            raise ParseError(f"{var_path}:{i}: type inconnu '{row['type']}' (attendu: {sorted(allowed_types)})")
-
-        low = _parse_float("low", row["low"], var_path, i, allow_empty=True)
-        up = _parse_float("up", row["up"], var_path, i, allow_empty=True)
-        if low is None:
-            low = 0.0  # défaut utile en LP (Linear Programming / Programmation Linéaire): x >= 0
-        if up is not None and up < low:
-            raise ParseError(f"{var_path}:{i}: up ({up}) < low ({low}) pour '{name}'")
-
-        variables[name] = {"low": low, "up": up, "type": vtype}
-
-    if not variables:
+    # Stockage en colonnes (SoA): DataFrame indexé par nom, colonnes low / up (NaN = non bornée) / type
+    vars_df = _read_csv_frame(var_path, ["name", "low", "up", "type"])
+    if vars_df.empty:
         raise ParseError(f"{var_path}: aucune variable déclarée")
+    names = vars_df["name"]
+    low = _parse_float_column(vars_df, "low", var_path, allow_empty=True)
+    up = _parse_float_column(vars_df, "up", var_path, allow_empty=True)
+    allowed_types = {"continuous", "integer", "binary"}
+    vtype = vars_df["type"].str.lower().where(vars_df["type"] != "", "continuous")
+
+    pos = _first_bad_row(names == "")
+    if pos is not None:
+        raise ParseError(f"{var_path}:{pos + 2}: 'name' vide")
+    pos = _first_bad_row(names.duplicated())
+    if pos is not None:
+        raise ParseError(f"{var_path}:{pos + 2}: variable dupliquée: '{names.iloc[pos]}'")
+    pos = _first_bad_row(~vtype.isin(allowed_types))
+    if pos is not None:
+        raise ParseError(
+            f"{var_path}:{pos + 2}: type inconnu '{vars_df['type'].iloc[pos]}' (attendu: {sorted(allowed_types)})"
+        )
+
+    low = low.fillna(0.0)  # défaut utile en LP (Linear Programming / Programmation Linéaire): x >= 0
+    pos = _first_bad_row(up < low)
+    if pos is not None:
+        raise ParseError(
+            f"{var_path}:{pos + 2}: up ({float(up.iloc[pos])}) < low ({float(low.iloc[pos])}) pour '{names.iloc[pos]}'"
+        )
+
+    var_names = [sys.intern(name) for name in names.tolist()]
+    variables = pd.DataFrame(
+        {"low": low.to_numpy(), "up": up.to_numpy(), "type": vtype.to_numpy()},
+        index=pd.Index(var_names, name="name"),
+    )
+    var_index = {name: k for k, name in enumerate(var_names)}
 
     # --- objective.csv / objectives.csv ---
-    obj_rows = _read_csv_dicts(obj_path, ["var", "coeff", "sense"])
+    obj_df = _read_csv_frame(obj_path, ["var", "coeff", "sense"])
+    obj_values = _parse_float_column(obj_df, "coeff", obj_path).tolist()
     obj_coeffs: Dict[str, float] = {}
     senses = set()
-    for i, row in enumerate(obj_rows, start=2):
-        var = row["var"]
+    rows = zip(obj_df["var"].tolist(), obj_values, obj_df["sense"].tolist())
+    for i, (var, coeff, raw_sense) in enumerate(rows, start=2):
         if not var:
             raise ParseError(f"{obj_path}:{i}: 'var' vide")
-        if var not in variables:
+        if var not in var_index:
             raise ParseError(f"{obj_path}:{i}: variable '{var}' non déclarée dans variables.csv")
-        coeff = _parse_float("coeff", row["coeff"], obj_path, i)
-        sense = row["sense"].lower() if row["sense"] else ""
+        sense = raw_sense.lower()
         if sense not in {"min", "max"}:
-            raise ParseError(f"{obj_path}:{i}: 'sense' doit être 'min' ou 'max' (reçu '{row['sense']}')")
+            raise ParseError(f"{obj_path}:{i}: 'sense' doit être 'min' ou 'max' (reçu '{raw_sense}')")
         if var in obj_coeffs:
             raise ParseError(f"{obj_path}:{i}: variable '{var}' dupliquée dans l'objectif")
         obj_coeffs[var] = coeff
@@ -209,11 +410,22 @@ def parse_data_dir(data_dir: str) -> Dict[str, Any]:
     objective = {"sense": senses.pop(), "coeffs": obj_coeffs}
 
     # --- constraints.csv ---
-    con_rows = _read_csv_dicts(con_path, ["name", "expr", "sense", "rhs"])
+    con_df = _read_csv_frame(con_path, ["name", "expr", "sense", "rhs"])
+    rhs_values = _parse_float_column(con_df, "rhs", con_path).tolist()
     constraints: List[Dict[str, Any]] = []
+    # sortie as_arrays: triplets CSR + colonnes alignées sur les lignes de A
+    a_rows: List[int] = []
+    a_cols: List[int] = []
+    a_vals: List[float] = []
+    b: List[float] = []
+    con_senses: List[str] = []
+    con_names: List[str] = []
     seen_names = set()
-    for i, row in enumerate(con_rows, start=2):
-        orig_name = (row["name"] or "").strip()
+    warnings: List[str] = []  # gardés pour le cache
+    exprs = con_df["expr"].tolist()
+    parsed_exprs = _parse_exprs(exprs, workers)
+    rows = zip(con_df["name"].tolist(), exprs, con_df["sense"].tolist(), rhs_values, parsed_exprs)
+    for i, (orig_name, expr, sense, rhs, parsed) in enumerate(rows, start=2):
         if not orig_name:
             orig_name = f"c_{i}"
 
@@ -225,49 +437,70 @@ def parse_data_dir(data_dir: str) -> Dict[str, Any]:
             while name in seen_names:
                 name = f"{base}#{k}"
                 k += 1
-            print(
+            warnings.append(
                 f"AVERTISSEMENT: {con_path}:{i}: nom de contrainte dupliqué '{orig_name}' "
-                f"→ renommé en '{name}'",
-                file=sys.stderr,
+                f"→ renommé en '{name}'"
             )
+            print(warnings[-1], file=sys.stderr)
         seen_names.add(name)
 
-        expr = row["expr"]
-        sense = (row["sense"] or "").strip()
         if sense not in {"<=", ">=", "=="}:
-            raise ParseError(f"{con_path}:{i}: sense doit être <=, >= ou == (reçu '{row['sense']}')")
-        rhs = _parse_float("rhs", row["rhs"], con_path, i)
+            raise ParseError(f"{con_path}:{i}: sense doit être <=, >= ou == (reçu '{sense}')")
 
-        # Parse LHS (Left-Hand Side)
-        coeffs, const_sum = parse_linear_expr(expr)
+        # LHS (Left-Hand Side) déjà parsé par _parse_exprs
+        if isinstance(parsed, ParseError):
+            raise parsed
+        coeffs, const_sum = parsed
 
-        # Vérifier que toutes les variables utilisées existent
+        # Vérifier que toutes les variables utilisées existent, en relevant leur index au passage
+        # (les clés de 'coeffs' sont ensuite remplacées par les noms internés de var_names: un seul
+        # objet str par nom, y compris pour des résultats revenus d'un worker par pickle)
+        cols: List[int] = []
         for v in coeffs:
-            if v not in variables:
+            k = var_index.get(v)
+            if k is None:
                 raise ParseError(f"{con_path}:{i}: variable '{v}' utilisée dans expr mais non déclarée")
+            cols.append(k)
 
         # Déplacer la constante du LHS vers le RHS
         adj_rhs = rhs - const_sum
 
+        if as_arrays:
+            a_rows.extend([len(b)] * len(cols))
+            a_cols.extend(cols)
+            a_vals.extend(coeffs.values())
+            b.append(adj_rhs)
+            con_senses.append(sense)
+            con_names.append(name)
+            continue
+
         constraints.append(
             {
                 "name": name,
                 "original_name": orig_name,
                 "sense": sense,
                 "rhs": adj_rhs,
-                "coeffs": coeffs,
+                "coeffs": dict(zip(map(var_names.__getitem__, cols), coeffs.values())),
                 "raw_expr": expr,
                 "raw_rhs": rhs,
                 "moved_const": const_sum,
             }
         )
 
-    if not constraints:
+    if not constraints and not b:
         raise ParseError(f"{con_path}: aucune contrainte fournie")
 
-    return {
-        "variables": variables,
-        "objective": objective,
-        "constraints": constraints,
-    }
+    if as_arrays:
+        model = model_arrays_from_triplets(
+            variables, objective, a_rows, a_cols, a_vals, b, con_senses, con_names, dtype=dtype
+        )
+    else:
+        model = {
+            "variables": variables,
+            "objective": objective,
+            "constraints": constraints,
+        }
+    if cache_path is not None:
+        _store_cache(cache_path, model, warnings)
+    return model
 
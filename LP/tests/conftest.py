@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Les modules s'importent comme dans main.py: 'from src.lpSolver...' depuis LP/
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,60 @@
+import os
+import pickle
+
+import numpy as np
+import pytest
+import scipy.sparse as sp
+
+from src.lpSolver.model_arrays import LPModelData
+from src.lpSolver.lite import solve_lp_with_progress
+
+needs_cbc = pytest.mark.skipif(not os.path.isfile("/opt/homebrew/bin/cbc"), reason="binaire CBC absent")
+
+
+def _small_lp(x_up: float = 1.3079737513433305) -> LPModelData:
+    """max x + y  s.c.  x + y <= 10, 0 <= x <= x_up (borne non ronde), 0 <= y <= 2."""
+    return LPModelData(
+        var_names=["x", "y"],
+        c=np.array([1.0, 1.0]),
+        sense="max",
+        A=sp.csr_matrix(np.array([[1.0, 1.0]])),
+        senses=["<="],
+        b=np.array([10.0]),
+        low=np.array([0.0, 0.0]),
+        up=np.array([x_up, 2.0]),
+        vtypes=np.array(["continuous", "continuous"]),
+        constr_names=["cap"],
+        var_index={"x": 0, "y": 1},
+    )
+
+
+@needs_cbc
+def test_cbc_warm_start_from_previous_result(tmp_path):
+    data = _small_lp()
+    first = solve_lp_with_progress(data, solver="cbc", msg=False, basis_path=str(tmp_path / "lp.bas"))
+    assert first["basis_path"] is not None
+    # CBC arrondit x au-dessus de sa borne: la valeur initiale doit être ramenée dans les bornes
+    again = solve_lp_with_progress(data, solver="cbc", msg=False, warm_start_from=first)
+    assert again["status"] == "Optimal"
+    assert again["objective"] == pytest.approx(first["objective"])
+
+
+@needs_cbc
+def test_cbc_warm_start_after_bound_change():
+    first = solve_lp_with_progress(_small_lp(), solver="cbc", msg=False)
+    again = solve_lp_with_progress(_small_lp(x_up=1.25), solver="cbc", msg=False, warm_start_from=first)
+    assert again["status"] == "Optimal"
+    assert again["objective"] == pytest.approx(3.25)
+
+
+def test_cbc_basis_path_with_whitespace_is_rejected(tmp_path):
+    with pytest.raises(ValueError, match="espace"):
+        solve_lp_with_progress(_small_lp(), solver="cbc", msg=False, basis_path=str(tmp_path / "with space.bas"))
+
+
+def test_result_is_a_plain_picklable_dict():
+    result = solve_lp_with_progress(_small_lp(), msg=False)
+    assert type(result) is dict and "details" in result
+    assert pickle.loads(pickle.dumps(result))["details"] == result["details"]
+    assert "Variables:" not in result["details"]
+    assert "Variables:" in solve_lp_with_progress(_small_lp(), msg=False, verbose=True)["details"]